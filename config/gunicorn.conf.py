@@ -0,0 +1,87 @@
+"""
+Gunicorn configuration for TaskMitra's production serving mode.
+
+    pip install gunicorn uvicorn whitenoise
+    python manage.py collectstatic
+    gunicorn -c config/gunicorn.conf.py
+
+Static files are served by WhiteNoise from STATIC_ROOT. Gunicorn listens on
+localhost only; put a reverse proxy (TLS, slow clients) in front of it, see
+SETUP.md.
+
+Workers run the ASGI application (needed for the /events/ live update
+stream) with uvicorn's worker class. Every setting can be overridden with
+the environment variables read below.
+"""
+
+import os
+
+# Must be set before the Django settings are imported by preload_app
+os.environ.setdefault('TASKMITRA_PRODUCTION', '1')
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+
+def _cpu_count():
+    # Respect CPU affinity / container limits where the platform exposes them
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+wsgi_app = os.environ.get('TASKMITRA_APP', 'config.asgi:application')
+worker_class = os.environ.get('TASKMITRA_WORKER_CLASS', 'uvicorn.workers.UvicornWorker')
+bind = os.environ.get('TASKMITRA_BIND', '127.0.0.1:8000')
+
+# Sized to the machine: (2 x cores) + 1
+workers = int(os.environ.get('WEB_CONCURRENCY', _cpu_count() * 2 + 1))
+
+# Load Django once in the master so workers share its memory (copy-on-write)
+preload_app = True
+
+# Recycle workers periodically to cap memory growth; jitter avoids all
+# workers restarting at the same moment
+max_requests = int(os.environ.get('TASKMITRA_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('TASKMITRA_MAX_REQUESTS_JITTER', 100))
+
+timeout = int(os.environ.get('TASKMITRA_TIMEOUT', 30))
+graceful_timeout = 30
+# Seconds an idle HTTP keep-alive connection waits for its next request
+keepalive = 5
+
+accesslog = '-'
+errorlog = '-'
+
+
+def on_starting(server):
+    """
+    Refuse to start several workers with the in-process event broker: a write
+    handled by one worker would only reach the live update streams connected
+    to that same worker.
+    """
+    from django.conf import settings
+    from django.utils.module_loading import import_string
+    from todo.events import InProcessBroker
+
+    broker = import_string(settings.TODO_EVENT_BROKER)
+    if server.cfg.workers > 1 and issubclass(broker, InProcessBroker):
+        raise RuntimeError(
+            f'{server.cfg.workers} workers need a shared event broker: set '
+            'TODO_SHARED_CACHE_URL to a Redis URL, or run with WEB_CONCURRENCY=1.'
+        )
+
+
+def when_ready(server):
+    """
+    Runs in the master after the app is preloaded, before workers are forked:
+    compile templates and import views once, so every worker inherits them.
+    """
+    from django.db import connections
+    from config.warmup import warmup
+
+    timings = warmup()
+    server.log.info('Warmup done: %s', ', '.join(f'{k} {v * 1000:.0f}ms' for k, v in timings.items()))
+
+    # Connections opened while loading the app must not be shared with forks
+    connections.close_all()
+
@@ -7,10 +7,14 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = 'django-insecure-wzjz3xhp8s(so$mav5us0skf(0q*$ze85(hpa@&9&@!8x3#hm@'
 
+# Production serving mode, enabled by config/gunicorn.conf.py
+# (or by exporting TASKMITRA_PRODUCTION=1 yourself).
+PRODUCTION = os.environ.get('TASKMITRA_PRODUCTION') == '1'
+
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = not PRODUCTION
 
-ALLOWED_HOSTS = []
+ALLOWED_HOSTS = os.environ.get('DJANGO_ALLOWED_HOSTS', 'localhost,127.0.0.1').split(',') if PRODUCTION else []
 
 
 # Application definition
@@ -34,7 +38,12 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'todo.middleware.DemoAuthMiddleware',  # Demo auth - will be replaced by API auth
+    'todo.middleware.ReplicaStickinessMiddleware',  # Read-your-writes for the read replica
+    'todo.middleware.RateLimitMiddleware',  # Per-URL-name limits from todo/urls.py
 ]
+if PRODUCTION:
+    # Uvicorn workers have no static file handler; WhiteNoise serves STATIC_ROOT
+    MIDDLEWARE.insert(1, 'whitenoise.middleware.WhiteNoiseMiddleware')
 
 ROOT_URLCONF = 'config.urls'
 # Auth handled by external app - no login/logout URLs needed
@@ -46,19 +55,41 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': ['templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # Compiled templates are kept in memory for the life of the process
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
                 'todo.context_processors.add_task_form_to_context',
+                'todo.context_processors.add_undo_delete_to_context',
             ],
         },
     },
 ]
 
 WSGI_APPLICATION = 'config.wsgi.application'
+ASGI_APPLICATION = 'config.asgi.application'
+
+# Live updates (Server-Sent Events)
+# Dotted path to the pub/sub backend used to fan out task/category changes.
+# The in-process broker only reaches clients connected to the same worker, so
+# multi-worker deployments use Redis pub/sub through TODO_SHARED_CACHE_URL.
+TODO_EVENT_BROKER = 'todo.events.InProcessBroker'
+if os.environ.get('TODO_SHARED_CACHE_URL'):
+    TODO_EVENT_BROKER = 'todo.events.RedisBroker'
+    TODO_EVENT_BROKER_URL = os.environ['TODO_SHARED_CACHE_URL']
+
+# Soft delete
+# Deleted tasks/categories can be restored for this many seconds; afterwards
+# `python manage.py purge_deleted` removes them in chunks.
+TODO_UNDO_WINDOW_SECONDS = 30
 
 
 # Database
@@ -71,6 +102,48 @@ DATABASES = {
     }
 }
 
+# CONN_MAX_AGE stays 0: the app is served through ASGI (config/asgi.py),
+# where every request's sync code runs in a new thread and database
+# connections are per thread, so persistent connections would never be
+# reused and would only stay open until garbage collected.
+
+# Optional read replica. List/aggregate views decorated with
+# @read_from_replica read from it; everything else uses 'default'.
+# Locally, point TODO_REPLICA_DB at a second SQLite file and keep it in sync
+# with `python manage.py replicate_sqlite --every 2`.
+TODO_REPLICA_ALIAS = 'replica'
+if os.environ.get('TODO_REPLICA_DB'):
+    DATABASES[TODO_REPLICA_ALIAS] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ['TODO_REPLICA_DB'],
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['todo.db_routers.ReplicaRouter']
+
+# Seconds a user keeps reading from the primary after a write
+TODO_REPLICA_STICKY_SECONDS = 5
+
+
+# Cache
+# The local-memory cache is per process. Set TODO_SHARED_CACHE_URL (a Redis
+# URL, needs the `redis` package) to share rate limit buckets across workers.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+}
+if os.environ.get('TODO_SHARED_CACHE_URL'):
+    CACHES['shared'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ['TODO_SHARED_CACHE_URL'],
+    }
+
+# Cache alias holding the token buckets of RateLimitMiddleware
+TODO_RATE_LIMIT_CACHE = 'shared' if 'shared' in CACHES else 'default'
+# Per-user "read from the primary" marks set after writes (see todo/db_routers.py)
+TODO_REPLICA_STICKY_CACHE = TODO_RATE_LIMIT_CACHE
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -110,6 +183,15 @@ STATIC_URL = '/static/'
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
+if PRODUCTION:
+    # Gzip/Brotli copies for WhiteNoise, made by `collectstatic`. Not the
+    # manifest (hashed names) variant: it fails on assets the templates link
+    # to but the project does not ship, such as todo/manifest.json.
+    STORAGES = {
+        'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+        'staticfiles': {'BACKEND': 'whitenoise.storage.CompressedStaticFilesStorage'},
+    }
+
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
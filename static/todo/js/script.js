@@ -10,6 +10,8 @@ document.addEventListener('DOMContentLoaded', () => {
     setupAddTaskModal();
     setupEditTaskModal();
     setupPWA();
+    setupLiveUpdates();
+    setupUndoToast();
 
     // Update the date/time display every minute
     setInterval(updateDateTime, 60000);
@@ -84,11 +86,17 @@ function setupAddTaskModal() {
         taskModal.style.display = 'none';
     };
 
-    const openModal = () => {
+    const parentInput = addTaskForm.querySelector('input[name="parent"]');
+
+    // Pass a task id to add the new task as a subtask of it
+    const openModal = (parentId) => {
+        parentInput.value = parentId || '';
+        taskModal.querySelector('.modal-header h3').lastChild.textContent = parentId ? ' Add Subtask' : ' Add New Task';
         taskModal.style.display = 'flex';
         // Focus the first input field for a better user experience
         taskModal.querySelector('input[name="title"]').focus();
     };
+    window.openAddTaskModal = openModal;
     
     // Attach listener to all "Add Task" buttons on the page
     openModalButtons.forEach(btn => {
@@ -144,6 +152,54 @@ function setupAddTaskModal() {
     });
 }
 
+/**
+ * Hides the "Undo" toast once the undo window has passed.
+ */
+function setupUndoToast() {
+    const toast = document.getElementById('undo-toast');
+    if (!toast) return;
+
+    const seconds = parseInt(toast.dataset.seconds, 10) || 30;
+    setTimeout(() => toast.remove(), seconds * 1000);
+}
+
+/**
+ * Subscribes to the Server-Sent Events stream so changes made in other tabs
+ * or devices are noticed without polling.
+ */
+function setupLiveUpdates() {
+    const banner = document.getElementById('live-update-banner');
+    if (!('EventSource' in window) || !banner) return;
+
+    const source = new EventSource('/events/');
+
+    // Pages that can refresh their data in place (e.g. the calendar) handle the
+    // "taskmitra:change" event and call preventDefault(). Everywhere else a
+    // banner offers a reload, so open modals and typed input are never lost
+    // and other tabs do not all reload on every write.
+    const onChange = (event) => {
+        const change = new CustomEvent('taskmitra:change', {
+            detail: JSON.parse(event.data),
+            cancelable: true,
+        });
+        if (document.dispatchEvent(change)) {
+            banner.hidden = false;
+        }
+    };
+
+    source.addEventListener('task', onChange);
+    source.addEventListener('category', onChange);
+
+    banner.querySelector('.live-update-refresh').addEventListener('click', () => {
+        window.location.reload();
+    });
+
+    // Servers without the ASGI stream (e.g. runserver) answer 404; stop retrying.
+    source.onerror = () => {
+        if (source.readyState === EventSource.CLOSED) source.close();
+    };
+}
+
 /**
  * Sets up Progressive Web App (PWA) features like the service worker
  * and the "Add to Home Screen" install prompt.
@@ -176,18 +232,24 @@ function setupEditTaskModal() {
             closeModal();
         }
     });
+    // Fill the form with task data; the version is posted back for conflict detection
+    const fillForm = (task) => {
+        document.getElementById('edit-title').value = task.title;
+        document.getElementById('edit-description').value = task.description || '';
+        document.getElementById('edit-category').value = task.category || '';
+        document.getElementById('edit-priority').value = task.priority;
+        document.getElementById('edit-status').value = task.status;
+        document.getElementById('edit-due_date').value = task.due_date || '';
+        document.getElementById('edit-task-version').value = task.version;
+        document.getElementById('edit-parent').value = task.parent || '';
+    };
     window.openEditTaskModal = function(taskId) {
         fetch(`/task/${taskId}/update/`, { method: 'GET', headers: { 'X-Requested-With': 'XMLHttpRequest' } })
         .then(response => response.json())
         .then(data => {
             if (data.success) {
                 document.getElementById('edit-task-id').value = taskId;
-                document.getElementById('edit-title').value = data.task.title;
-                document.getElementById('edit-description').value = data.task.description || '';
-                document.getElementById('edit-category').value = data.task.category || '';
-                document.getElementById('edit-priority').value = data.task.priority;
-                document.getElementById('edit-status').value = data.task.status;
-                document.getElementById('edit-due_date').value = data.task.due_date || '';
+                fillForm(data.task);
                 editModal.style.display = 'flex';
                 document.getElementById('edit-title').focus();
             }
@@ -202,6 +264,10 @@ function setupEditTaskModal() {
         .then(data => {
             if (data.success) {
                 window.location.reload();
+            } else if (data.conflict) {
+                // Someone else saved first: show their version instead of overwriting it
+                fillForm(data.task);
+                alert(data.message);
             } else {
                 let errorMessages = 'Please correct the following errors:\n\n';
                 for (const field in data.errors) {
@@ -5,3 +5,6 @@ class TodoConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'todo'
 
+    def ready(self):
+        # Register signal handlers that publish live update events
+        from . import signals  # noqa: F401
@@ -0,0 +1,59 @@
+# todo/calendar_feed.py
+"""
+Compact columnar JSON feed for the calendar view.
+
+Tasks due in a date window are read with one ``values_list`` range query on
+the ``(user, due_date)`` index, without creating model instances, and sent
+as parallel arrays instead of one object per task::
+
+    {"start": "2025-06-01", "end": "2025-06-30",
+     "ids": [7, 9], "titles": ["Plan", "Ship"], "days": [0, 14],
+     "priorities": [0, 2], "colors": [0, null], "palette": ["#2e86de"]}
+
+``days`` are offsets from ``start``, ``priorities`` index ``PRIORITIES`` and
+``colors`` index ``palette`` (``null``: no category).
+"""
+
+from django.db.models import Case, F, When
+
+from .models import Task
+
+
+PRIORITIES = [value for value, _ in Task.Priority.choices]
+PRIORITY_CODES = {value: code for code, value in enumerate(PRIORITIES)}
+
+FEED_FIELDS = ('id', 'title', 'due_date', 'priority', 'category_color')
+
+# Longest window one request may ask for; a month view shows up to 6 weeks
+MAX_WINDOW_DAYS = 62
+
+
+def feed_rows(user, start, end):
+    """Plain ``FEED_FIELDS`` tuples of the user's tasks due between ``start`` and ``end``."""
+    return Task.objects.filter(user=user, due_date__range=(start, end)).annotate(
+        # Categories pending deletion no longer color their tasks
+        category_color=Case(When(category__deleted_at__isnull=True, then=F('category__color'))),
+    ).order_by('due_date', 'pk').values_list(*FEED_FIELDS)
+
+
+def build_calendar_feed(rows, start, end):
+    ids, titles, days, priorities, colors = [], [], [], [], []
+    palette = {}
+    origin = start.toordinal()
+    for pk, title, due_date, priority, color in rows:
+        ids.append(pk)
+        titles.append(title)
+        days.append(due_date.toordinal() - origin)
+        priorities.append(PRIORITY_CODES[priority])
+        colors.append(None if color is None else palette.setdefault(color, len(palette)))
+
+    return {
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'ids': ids,
+        'titles': titles,
+        'days': days,
+        'priorities': priorities,
+        'colors': colors,
+        'palette': list(palette),
+    }
@@ -0,0 +1,87 @@
+# todo/cards.py
+"""
+Lightweight view models for the task card grids.
+
+Cards are built straight from ``values_list`` rows, and everything the
+card templates used to compute per card with filters (status/priority
+labels, CSS classes, truncated descriptions, formatted dates, URLs) is
+computed once per distinct value and reused.
+"""
+
+from functools import lru_cache
+
+from django.urls import get_script_prefix, reverse
+from django.utils import formats, timezone, translation
+from django.utils.text import Truncator, slugify
+
+from .models import Task
+
+
+CARD_FIELDS = ('id', 'title', 'description', 'priority', 'status', 'due_date', 'created_at')
+
+# (label, css class) per choice value, computed once at import time
+STATUS_DISPLAY = {value: (label, slugify(value)) for value, label in Task.Status.choices}
+PRIORITY_DISPLAY = {value: (label, slugify(value)) for value, label in Task.Priority.choices}
+
+# Placeholder id used to build URL templates once instead of reversing per card
+_URL_ID_PLACEHOLDER = 2147483647
+
+
+@lru_cache(maxsize=64)
+def _url_template(url_name, script_prefix):
+    return reverse(url_name, args=[_URL_ID_PLACEHOLDER]).replace(str(_URL_ID_PLACEHOLDER), '{}')
+
+
+def task_url(url_name, pk):
+    """Same result as ``{% url url_name pk %}`` for URLs taking a single id."""
+    return _url_template(url_name, get_script_prefix()).format(pk)
+
+
+@lru_cache(maxsize=4096)
+def _format_date(value, date_format, language):
+    return formats.date_format(value, date_format)
+
+
+def format_date(value, date_format):
+    """Cached equivalent of the ``date`` filter; many cards share the same dates."""
+    if not value:
+        return ''
+    if hasattr(value, 'tzinfo'):
+        value = timezone.localtime(value).date()
+    return _format_date(value, date_format, translation.get_language())
+
+
+class TaskCard:
+    """Everything a task card template needs, without a model instance."""
+    __slots__ = (
+        'id', 'title', 'description', 'excerpt', 'priority', 'priority_label',
+        'priority_class', 'status', 'status_label', 'status_class', 'due_date',
+        'created_at', 'detail_url', 'update_url',
+    )
+
+    def __init__(self, id, title, description, priority, status, due_date, created_at, excerpt_words):
+        self.id = id
+        self.title = title
+        self.description = description
+        self.excerpt = Truncator(description).words(excerpt_words, truncate=' …') if description else ''
+        self.priority = priority
+        self.priority_label, self.priority_class = PRIORITY_DISPLAY[priority]
+        self.status = status
+        self.status_label, self.status_class = STATUS_DISPLAY[status]
+        self.due_date = due_date
+        self.created_at = created_at
+        self.detail_url = task_url('task_detail', id)
+        self.update_url = task_url('task_update', id)
+
+    @property
+    def due_date_display(self):
+        return format_date(self.due_date, 'd M, Y')
+
+    @property
+    def created_display(self):
+        return format_date(self.created_at, 'd/m/Y')
+
+
+def build_task_cards(rows, excerpt_words=15):
+    """Builds cards from ``tasks.values_list(*CARD_FIELDS)`` rows."""
+    return [TaskCard(*row, excerpt_words=excerpt_words) for row in rows]
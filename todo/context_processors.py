@@ -1,4 +1,6 @@
 # todo/context_processors.py
+from django.conf import settings
+
 from .forms import TaskForm
 
 def add_task_form_to_context(request):
@@ -10,4 +12,18 @@ def add_task_form_to_context(request):
         # We must pass the user to the form so it can filter categories correctly
         form = TaskForm(user=request.user)
         return {'task_create_form': form}
-    return {}
\ No newline at end of file
+    return {}
+
+
+def add_undo_delete_to_context(request):
+    """
+    Exposes the last soft-delete (set by views.remember_undo) to the next
+    rendered page, so it can show an "Undo" button once.
+    """
+    if not request.user.is_authenticated:
+        return {}
+    undo_delete = request.session.pop('undo_delete', None)
+    if undo_delete:
+        undo_delete['seconds'] = settings.TODO_UNDO_WINDOW_SECONDS
+        return {'undo_delete': undo_delete}
+    return {}
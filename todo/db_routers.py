@@ -0,0 +1,90 @@
+# todo/db_routers.py
+"""
+Read-replica routing for TaskMitra.
+
+Writes always go to ``default``. Reads go to the replica alias
+(``TODO_REPLICA_ALIAS``) only inside views decorated with
+``@read_from_replica``, and only when that alias is configured.
+After a write the user is pinned to the primary for a few seconds
+(see ``ReplicaStickinessMiddleware``), so they see their own changes
+even if the replica lags behind, on every device and not only in the
+browser that made the write.
+"""
+
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+
+
+# Cookie set after a write; while present, reads stay on the primary
+STICKY_COOKIE = 'todo_read_primary'
+
+_read_from_replica = ContextVar('todo_read_from_replica', default=False)
+
+
+def replica_alias():
+    """Return the configured replica alias, or None if there is no replica."""
+    alias = getattr(settings, 'TODO_REPLICA_ALIAS', None)
+    return alias if alias in settings.DATABASES else None
+
+
+def _sticky_user_key(user_id):
+    return f'replica:sticky:user:{user_id}'
+
+
+def mark_sticky(user):
+    """Keep this user's reads on the primary for TODO_REPLICA_STICKY_SECONDS."""
+    caches[settings.TODO_REPLICA_STICKY_CACHE].set(
+        _sticky_user_key(user.pk), 1, settings.TODO_REPLICA_STICKY_SECONDS
+    )
+
+
+def is_sticky(request):
+    if STICKY_COOKIE in request.COOKIES:
+        return True
+    # Other tabs and devices of the same user reload right after the write
+    # (live updates), without the cookie of the browser that made it
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        return False
+    return caches[settings.TODO_REPLICA_STICKY_CACHE].get(_sticky_user_key(user.pk)) is not None
+
+
+def read_from_replica(view_func):
+    """
+    Decorator for read-only views: route their queries to the replica,
+    unless the user recently wrote something or the request is not a GET.
+    """
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        if replica_alias() is None or request.method not in ('GET', 'HEAD') or is_sticky(request):
+            return view_func(request, *args, **kwargs)
+        token = _read_from_replica.set(True)
+        try:
+            return view_func(request, *args, **kwargs)
+        finally:
+            _read_from_replica.reset(token)
+    return _wrapped_view
+
+
+class ReplicaRouter:
+    """Sends reads to the replica when the current view asked for it."""
+
+    def db_for_read(self, model, **hints):
+        if _read_from_replica.get():
+            return replica_alias() or DEFAULT_DB_ALIAS
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data, so relations across them are fine
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica receives its schema through replication
+        return db == DEFAULT_DB_ALIAS
@@ -0,0 +1,190 @@
+# todo/events.py
+"""
+Live update broker for TaskMitra.
+
+Task and category changes are published per user and fanned out to every
+open Server-Sent Events connection of that user (see ``todo/sse.py``).
+The broker backend is pluggable through the ``TODO_EVENT_BROKER`` setting,
+which holds a dotted path to a ``BaseBroker`` subclass: ``InProcessBroker``
+for a single process, ``RedisBroker`` when several workers serve the app.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+DEFAULT_BROKER = 'todo.events.InProcessBroker'
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """
+    A single listener (one open SSE connection) for one user.
+    Events are delivered into an asyncio queue bound to the listener's loop,
+    so publishers running in worker threads can hand them over safely.
+    """
+    __slots__ = ('user_id', 'queue', 'loop')
+
+    def __init__(self, user_id, loop, maxsize=100):
+        self.user_id = user_id
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=maxsize)
+
+    def deliver(self, event):
+        """Queue an event; slow consumers drop events instead of growing memory."""
+        if not self.queue.full():
+            self.queue.put_nowait(event)
+
+    def close(self):
+        """Wake the consumer with a ``None`` sentinel so it can stop streaming."""
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+    async def get(self):
+        return await self.queue.get()
+
+
+class BaseBroker:
+    """
+    Interface for pub/sub backends.
+    Subclasses must implement ``subscribe``, ``unsubscribe`` and ``publish``.
+    """
+
+    def subscribe(self, user_id):
+        raise NotImplementedError
+
+    def unsubscribe(self, subscription):
+        raise NotImplementedError
+
+    def publish(self, user_id, event):
+        raise NotImplementedError
+
+
+class InProcessBroker(BaseBroker):
+    """
+    Keeps subscribers in memory for the current process.
+    Suitable for a single ASGI worker; multi-worker deployments should plug in
+    a shared backend (e.g. Redis pub/sub) with the same interface.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    def subscribe(self, user_id):
+        subscription = Subscription(user_id, asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers[user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            listeners = self._subscribers.get(subscription.user_id)
+            if listeners is None:
+                return
+            listeners.discard(subscription)
+            if not listeners:
+                del self._subscribers[subscription.user_id]
+
+    def publish(self, user_id, event):
+        with self._lock:
+            listeners = list(self._subscribers.get(user_id, ()))
+        for subscription in listeners:
+            # Publishers usually run in a sync worker thread, never in the
+            # listener's event loop, so always go through call_soon_threadsafe.
+            subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+
+    def subscriber_count(self, user_id=None):
+        with self._lock:
+            if user_id is not None:
+                return len(self._subscribers.get(user_id, ()))
+            return sum(len(listeners) for listeners in self._subscribers.values())
+
+
+class RedisBroker(BaseBroker):
+    """
+    Shares events between worker processes through Redis pub/sub, for
+    deployments with several workers. Each process keeps its own listeners in
+    an ``InProcessBroker`` and runs one thread that receives every published
+    event from Redis and hands it to them. Needs the ``redis`` package and
+    ``TODO_EVENT_BROKER_URL``.
+    """
+    channel = 'taskmitra:events'
+    # Seconds to wait before reconnecting after the Redis connection dropped
+    reconnect_delay = 1
+
+    def __init__(self, url=None):
+        import redis
+
+        self._redis = redis.Redis.from_url(url or settings.TODO_EVENT_BROKER_URL)
+        self._local = InProcessBroker()
+        self._listener = None
+        self._lock = threading.Lock()
+
+    def subscribe(self, user_id):
+        # Started lazily, so it runs in the worker process rather than in a
+        # preloading master that forks afterwards
+        with self._lock:
+            if self._listener is None:
+                self._listener = threading.Thread(target=self._listen, name='todo-events', daemon=True)
+                self._listener.start()
+        return self._local.subscribe(user_id)
+
+    def unsubscribe(self, subscription):
+        self._local.unsubscribe(subscription)
+
+    def publish(self, user_id, event):
+        self._redis.publish(self.channel, json.dumps({'user_id': user_id, 'event': event}))
+
+    def subscriber_count(self, user_id=None):
+        return self._local.subscriber_count(user_id)
+
+    def _listen(self):
+        while True:
+            pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(self.channel)
+                for message in pubsub.listen():
+                    payload = json.loads(message['data'])
+                    self._local.publish(payload['user_id'], payload['event'])
+            except Exception:
+                logger.exception('Lost the Redis event subscription; reconnecting')
+                time.sleep(self.reconnect_delay)
+            finally:
+                pubsub.close()
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """Return the process-wide broker configured by ``TODO_EVENT_BROKER``."""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                broker_path = getattr(settings, 'TODO_EVENT_BROKER', DEFAULT_BROKER)
+                _broker = import_string(broker_path)()
+    return _broker
+
+
+def publish_change(user_id, model, action, pk):
+    """
+    Publish a change event such as ``{'model': 'task', 'action': 'saved', 'id': 3}``.
+    Live updates are best-effort: this runs after the write has committed, so
+    a broker failure (e.g. Redis down) is logged instead of failing the request.
+    """
+    try:
+        get_broker().publish(user_id, {'model': model, 'action': action, 'id': pk})
+    except Exception:
+        logger.exception('Could not publish a live update event for user %s', user_id)
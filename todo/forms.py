@@ -1,12 +1,15 @@
 from django import forms
-from .models import Task, Category
+from django.db import models
+from django.db.models.functions import Length
+from .models import Task, Category, MAX_TASK_DEPTH, path_depth
+from .calendar_feed import MAX_WINDOW_DAYS
 from django.contrib.auth.models import User
 
 
 class TaskForm(forms.ModelForm):
     class Meta:
         model = Task
-        fields = ['title', 'description', 'category', 'priority', 'status', 'due_date']
+        fields = ['title', 'description', 'category', 'priority', 'status', 'due_date', 'parent']
         widgets = {
             'title': forms.TextInput(attrs={
                 'placeholder': 'Enter task title...',
@@ -24,6 +27,8 @@ class TaskForm(forms.ModelForm):
             'priority': forms.Select(attrs={'class': 'form-control'}),
             'status': forms.Select(attrs={'class': 'form-control'}),
             'category': forms.Select(attrs={'class': 'form-control'}),
+            # Set by the "Add Subtask" button, not picked by hand
+            'parent': forms.HiddenInput(),
         }
         
     def __init__(self, *args, **kwargs):
@@ -34,6 +39,98 @@ class TaskForm(forms.ModelForm):
             # Filter the category queryset to only show categories belonging to the current user
             self.fields['category'].queryset = Category.objects.filter(user=user)
             self.fields['category'].empty_label = "No Category"
+            self.fields['parent'].queryset = Task.objects.filter(user=user)
+
+    def clean_parent(self):
+        parent = self.cleaned_data.get('parent')
+        task = self.instance
+        if parent is None or parent.pk == task.parent_id:
+            return parent
+        if task.pk and (parent.pk == task.pk or parent.path.startswith(task.subtree_prefix)):
+            raise forms.ValidationError('A task cannot be a subtask of itself or of its own subtasks.')
+        # The task's own subtasks move along, so they must fit below the new parent too
+        levels = 1
+        if task.pk:
+            deepest = task.get_descendants().order_by(Length('path').desc()).values_list('path', flat=True).first()
+            if deepest is not None:
+                levels += path_depth(deepest) - task.depth
+        if parent.depth + levels > MAX_TASK_DEPTH:
+            raise forms.ValidationError('Subtasks cannot be nested this deep.')
+        return parent
+
+
+class TaskIdListField(forms.Field):
+    """A list of task ids posted as repeated ``task_ids`` values."""
+    widget = forms.MultipleHiddenInput
+
+    def to_python(self, value):
+        if not value:
+            return []
+        try:
+            return sorted({int(task_id) for task_id in value})
+        except (TypeError, ValueError):
+            raise forms.ValidationError('Invalid task id.')
+
+
+class TaskBulkActionForm(forms.Form):
+    """
+    Validates a bulk action on several tasks selected on the My Tasks page.
+    Task ownership is enforced by the view's queryset, not here.
+    """
+    MAX_TASKS = 1000
+
+    class Action(models.TextChoices):
+        COMPLETE = 'complete', 'Mark completed'
+        REOPEN = 'reopen', 'Reopen'
+        PRIORITY = 'priority', 'Change priority'
+        CATEGORY = 'category', 'Move to category'
+        DELETE = 'delete', 'Delete'
+
+    action = forms.ChoiceField(choices=Action.choices)
+    task_ids = TaskIdListField()
+    priority = forms.ChoiceField(choices=Task.Priority.choices, required=False)
+    category = forms.ModelChoiceField(queryset=Category.objects.none(), required=False)
+
+    def __init__(self, *args, **kwargs):
+        user = kwargs.pop('user', None)
+        super().__init__(*args, **kwargs)
+        if user:
+            self.fields['category'].queryset = Category.objects.filter(user=user)
+        self.fields['category'].empty_label = "No Category"
+
+    def clean_task_ids(self):
+        task_ids = self.cleaned_data['task_ids']
+        if len(task_ids) > self.MAX_TASKS:
+            raise forms.ValidationError(f'Select at most {self.MAX_TASKS} tasks at a time.')
+        return task_ids
+
+    def clean(self):
+        cleaned_data = super().clean()
+        action = cleaned_data.get('action')
+        if action == self.Action.PRIORITY and not cleaned_data.get('priority'):
+            self.add_error('priority', 'Choose a priority.')
+        return cleaned_data
+
+
+class TaskRestoreForm(forms.Form):
+    """Task ids posted by the "Undo" button after a delete."""
+    task_ids = TaskIdListField()
+
+
+class CalendarWindowForm(forms.Form):
+    """The date window (both days included) requested by the calendar feed."""
+    start = forms.DateField()
+    end = forms.DateField()
+
+    def clean(self):
+        cleaned_data = super().clean()
+        start, end = cleaned_data.get('start'), cleaned_data.get('end')
+        if start and end:
+            if end < start:
+                self.add_error('end', 'The end date must not be before the start date.')
+            elif (end - start).days >= MAX_WINDOW_DAYS:
+                self.add_error('end', f'Request at most {MAX_WINDOW_DAYS} days at a time.')
+        return cleaned_data
 
 
 class CategoryForm(forms.ModelForm):
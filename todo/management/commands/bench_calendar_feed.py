@@ -0,0 +1,109 @@
+# todo/management/commands/bench_calendar_feed.py
+import json
+import random
+import time
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from todo.calendar_feed import build_calendar_feed, feed_rows
+from todo.models import Category, Task
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        'Calendar feed benchmark: creates one user with many dated tasks, then '
+        'compares a per-object feed built from model instances with the columnar '
+        'values_list feed, for a month window and for all tasks. Reports query, '
+        'build and JSON serialization times and the payload size.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=100000)
+        parser.add_argument('--days', type=int, default=365,
+                            help='Due dates are spread over this many days.')
+        parser.add_argument('--repeat', type=int, default=3,
+                            help='Runs per variant; the best time is reported.')
+
+    def handle(self, *args, **options):
+        user, _ = User.objects.get_or_create(username='bench_calendar')
+        first_day = date(2025, 1, 1)
+        try:
+            self.populate(user, first_day, options)
+            last_day = first_day + timedelta(days=options['days'] - 1)
+            windows = (
+                ('month window', first_day, first_day + timedelta(days=41)),
+                ('all tasks', first_day, last_day),
+            )
+            for label, start, end in windows:
+                self.stdout.write(f'{label} ({start} .. {end})')
+                for name, build in (('objects', self.object_feed), ('columnar', self.columnar_feed)):
+                    self.report(name, lambda: build(user, start, end), options['repeat'])
+        finally:
+            user.delete()
+
+    def populate(self, user, first_day, options):
+        rng = random.Random(42)
+        categories = [
+            Category.objects.create(user=user, name=name, color=color)
+            for name, color in (('Work', '#2e86de'), ('Home', '#28a745'), ('Health', '#dc3545'))
+        ] + [None]
+        words = 'plan write review ship fix call email design test deploy meet sync'.split()
+        priorities = [choice for choice, _ in Task.Priority.choices]
+        Task.objects.bulk_create(
+            (
+                Task(
+                    user=user,
+                    category=rng.choice(categories),
+                    title=' '.join(rng.choices(words, k=4)).capitalize(),
+                    description=' '.join(rng.choices(words, k=30)),
+                    priority=rng.choice(priorities),
+                    due_date=first_day + timedelta(days=rng.randrange(options['days'])),
+                )
+                for _ in range(options['tasks'])
+            ),
+            batch_size=2000,
+        )
+        self.stdout.write(f'{options["tasks"]} tasks for one user over {options["days"]} days')
+
+    @staticmethod
+    def object_feed(user, start, end):
+        # One JSON object per task, built from full model instances
+        tasks = Task.objects.filter(user=user, due_date__range=(start, end)).select_related('category')
+        return {'tasks': [
+            {
+                'id': task.id,
+                'title': task.title,
+                'due_date': task.due_date.isoformat(),
+                'priority': task.priority,
+                'color': task.category.color if task.category else None,
+            }
+            for task in tasks.order_by('due_date', 'pk')
+        ]}
+
+    @staticmethod
+    def columnar_feed(user, start, end):
+        return build_calendar_feed(feed_rows(user, start, end), start, end)
+
+    def report(self, name, build, repeat):
+        best = None
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                feed = build()
+                built = time.perf_counter()
+                payload = json.dumps(feed, separators=(',', ':'))
+                done = time.perf_counter()
+            timing = (built - started, done - built)
+            if best is None or sum(timing) < sum(best):
+                best = timing
+        self.stdout.write(
+            f'  {name:>8}: query+build {best[0] * 1000:8.1f} ms, '
+            f'json {best[1] * 1000:7.1f} ms, {len(payload) / 1024:8.1f} KiB, '
+            f'{len(queries)} quer{"y" if len(queries) == 1 else "ies"}'
+        )
@@ -0,0 +1,67 @@
+# todo/management/commands/bench_cold_start.py
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import Client
+
+
+PAGES = ['/', '/my-tasks/', '/categories/']
+
+
+class Command(BaseCommand):
+    help = (
+        'Cold-start latency benchmark: start fresh processes, optionally run '
+        'the startup warmup (config/warmup.py), then time the first request to '
+        'each main page.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5,
+                            help='Fresh processes to start per mode.')
+        # Internal: run a single measurement inside the current process
+        parser.add_argument('--child', choices=['cold', 'warm'], help='(internal)')
+
+    def handle(self, *args, **options):
+        if options['child']:
+            self.stdout.write(json.dumps(self.measure(options['child'] == 'warm')))
+            return
+
+        for mode in ('cold', 'warm'):
+            samples = [self.spawn(mode) for _ in range(options['runs'])]
+            self.stdout.write(f'{mode}:')
+            if mode == 'warm':
+                warmup = statistics.median(s['warmup'] for s in samples)
+                self.stdout.write(f'  {"warmup (before traffic)":<24} {warmup * 1000:8.1f} ms')
+            for page in PAGES:
+                first = statistics.median(s['pages'][page] for s in samples)
+                self.stdout.write(f'  first GET {page:<14} {first * 1000:8.1f} ms')
+
+    def spawn(self, mode):
+        output = subprocess.run(
+            [sys.executable, sys.argv[0], 'bench_cold_start', '--child', mode],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        return json.loads(output.strip().splitlines()[-1])
+
+    def measure(self, warm):
+        from config.warmup import warmup
+
+        client = Client(HTTP_HOST='localhost')
+        # A server builds its middleware chain while loading the app
+        client.handler.load_middleware()
+
+        result = {'warmup': 0, 'pages': {}}
+        if warm:
+            started = time.perf_counter()
+            warmup()
+            result['warmup'] = time.perf_counter() - started
+
+        for page in PAGES:
+            started = time.perf_counter()
+            client.get(page)
+            result['pages'][page] = time.perf_counter() - started
+        return result
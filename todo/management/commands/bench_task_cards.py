@@ -0,0 +1,124 @@
+# todo/management/commands/bench_task_cards.py
+import random
+import re
+import time
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+
+from django.core.management.base import BaseCommand
+from django.template import engines
+
+from todo.cards import CARD_FIELDS, build_task_cards
+from todo.models import Task
+
+
+# The My Tasks grid as it was rendered before the card partials: model
+# instances in a {% for %} loop with per-card filters and {% url %}
+LEGACY_GRID = """
+{% for task in tasks %}
+<article 
+    class="my-task-card priority-{{ task.priority }} status-{{ task.status|slugify }}" 
+    tabindex="0" 
+    role="button" 
+    aria-label="View details for {{ task.title }}"
+    data-task-id="{{ task.id }}"
+    data-task-detail-url="{% url 'task_detail' task.id %}"> {# URL for fetching details #}
+    
+    <div class="card-content">
+        <input type="checkbox" class="task-select" value="{{ task.id }}" aria-label="Select {{ task.title }}">
+        <h3 class="card-title">{{ task.title }}</h3>
+        {% if task.description %}
+        <p class="card-description">{{ task.description|truncatewords:15 }}</p>
+        {% endif %}
+    </div>
+    <div class="card-footer">
+        {% if task.due_date %}
+        <span class="card-due-date"><i class="fas fa-calendar-alt"></i> {{ task.due_date|date:"d M, Y" }}</span>
+        {% endif %}
+        <span class="card-status status-{{ task.status|slugify }}">{{ task.get_status_display }}</span>
+    </div>
+</article>
+{% endfor %}
+"""
+
+CARD_GRID = "{% load task_cards %}{% render_cards cards 'todo/partials/task_card.html' %}"
+
+MODEL_FIELDS = [field.attname for field in Task._meta.concrete_fields]
+
+
+class Command(BaseCommand):
+    help = (
+        'Render benchmark for the My Tasks grid: the legacy inline {% for %} '
+        'markup over model instances vs. card partials over precomputed TaskCards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cards', type=int, default=10000)
+        parser.add_argument('--repeat', type=int, default=3,
+                            help='Renders per variant; the best time is reported.')
+
+    def handle(self, *args, **options):
+        rows = self.make_rows(options['cards'])
+        engine = engines['django']
+        legacy = engine.from_string(LEGACY_GRID)
+        fast = engine.from_string(CARD_GRID)
+
+        def render_legacy():
+            # What the ORM does for each row of a full-model queryset
+            tasks = [Task.from_db('default', MODEL_FIELDS, row) for row in rows]
+            return legacy.render({'tasks': tasks})
+
+        def render_cards():
+            card_fields = [MODEL_FIELDS.index(field) for field in CARD_FIELDS]
+            cards = build_task_cards(tuple(row[i] for i in card_fields) for row in rows)
+            return fast.render({'cards': cards})
+
+        results = {}
+        for name, render in (('legacy', render_legacy), ('cards', render_cards)):
+            timings = []
+            for _ in range(options['repeat']):
+                started = time.perf_counter()
+                html = render()
+                timings.append(time.perf_counter() - started)
+            results[name] = (min(timings), html)
+
+        same = self.normalize(results['legacy'][1]) == self.normalize(results['cards'][1])
+        legacy_time, cards_time = results['legacy'][0], results['cards'][0]
+        self.stdout.write(f'{options["cards"]} cards')
+        self.stdout.write(f'  legacy inline loop: {legacy_time * 1000:8.1f} ms')
+        self.stdout.write(f'  card partials:      {cards_time * 1000:8.1f} ms ({legacy_time / cards_time:.1f}x faster)')
+        self.stdout.write(f'  identical HTML:     {same}')
+
+    @staticmethod
+    def normalize(html):
+        html = re.sub(r'\{#.*?#\}', '', html)
+        return re.sub(r'\s+', ' ', html).strip()
+
+    @staticmethod
+    def make_rows(count):
+        rng = random.Random(42)
+        now = datetime(2025, 6, 1, 12, 0, tzinfo=dt_timezone.utc)
+        words = 'plan write review ship fix call email design test deploy meet sync'.split()
+        values = {
+            'priority': [choice for choice, _ in Task.Priority.choices],
+            'status': [choice for choice, _ in Task.Status.choices],
+        }
+        rows = []
+        for pk in range(1, count + 1):
+            record = {
+                'id': pk,
+                'user_id': 1,
+                'category_id': None,
+                'parent_id': None,
+                'path': '',
+                'title': ' '.join(rng.choices(words, k=4)).capitalize(),
+                'description': ' '.join(rng.choices(words, k=rng.randint(0, 40))) or None,
+                'priority': rng.choice(values['priority']),
+                'status': rng.choice(values['status']),
+                'due_date': date(2025, 6, 1) + timedelta(days=rng.randint(0, 90)) if rng.random() < 0.7 else None,
+                'created_at': now - timedelta(minutes=pk),
+                'completed_at': None,
+                'deleted_at': None,
+                'version': 1,
+            }
+            rows.append(tuple(record[field] for field in MODEL_FIELDS))
+        return rows
@@ -0,0 +1,81 @@
+# todo/management/commands/bench_task_updates.py
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from todo.models import Task
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        'Multi-threaded stress test for task updates. Several threads do '
+        'read-modify-write increments on the same task, once with plain full-row '
+        'saves and once with versioned update_fields saves, then report lost '
+        'updates and bytes sent in UPDATE statements.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--updates', type=int, default=50,
+                            help='Successful increments each thread performs.')
+        parser.add_argument('--think-time', type=float, default=0.001,
+                            help='Seconds between reading and writing, like a real request.')
+
+    def handle(self, *args, **options):
+        user, _ = User.objects.get_or_create(username='bench_concurrency')
+        description = 'x' * 2000  # realistic rich-text payload that never changes
+        try:
+            for mode in ('full_save', 'versioned'):
+                task = Task.objects.create(user=user, title='0', description=description)
+                stats = self.run(mode, task.pk, options)
+                final = int(Task.objects.get(pk=task.pk).title)
+                expected = options['threads'] * options['updates']
+                self.stdout.write(
+                    f'{mode:>10}: {final}/{expected} increments kept, '
+                    f'{expected - final} lost, {stats["conflicts"]} conflicts retried, '
+                    f'{stats["bytes"] / 1024:.1f} KiB in UPDATEs, {stats["elapsed"]:.2f}s'
+                )
+        finally:
+            user.delete()
+
+    def run(self, mode, task_pk, options):
+        stats = {'bytes': 0, 'conflicts': 0}
+        lock = threading.Lock()
+
+        def count_update_bytes(execute, sql, params, many, context):
+            if sql.startswith('UPDATE'):
+                with lock:
+                    stats['bytes'] += len(sql.encode()) + sum(len(str(p).encode()) for p in params or ())
+            return execute(sql, params, many, context)
+
+        def worker():
+            try:
+                with connection.execute_wrapper(count_update_bytes):
+                    done = 0
+                    while done < options['updates']:
+                        task = Task.objects.get(pk=task_pk)
+                        time.sleep(options['think_time'])
+                        task.title = str(int(task.title) + 1)
+                        if mode == 'full_save':
+                            task.save()
+                        elif not task.save_if_version(task.version, ['title']):
+                            with lock:
+                                stats['conflicts'] += 1
+                            continue
+                        done += 1
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(options['threads'])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats['elapsed'] = time.perf_counter() - started
+        return stats
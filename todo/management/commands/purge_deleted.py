@@ -0,0 +1,73 @@
+# todo/management/commands/purge_deleted.py
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from todo.models import Task, Category, has_live_descendants, undo_cutoff
+
+
+class Command(BaseCommand):
+    help = (
+        'Permanently delete soft-deleted tasks and categories whose undo window '
+        'has passed. Works in small chunks so no long write locks are held; run '
+        'it from cron or keep it running in the background with --every.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500,
+                            help='Rows deleted or updated per transaction.')
+        parser.add_argument('--pause', type=float, default=0.05,
+                            help='Seconds to sleep between chunks.')
+        parser.add_argument('--every', type=float, default=0,
+                            help='Repeat every N seconds instead of running once.')
+
+    def handle(self, *args, **options):
+        self.chunk_size = options['chunk_size']
+        self.pause = options['pause']
+
+        while True:
+            cutoff = undo_cutoff()
+            tasks = self.purge_tasks(cutoff)
+            categories = self.purge_categories(cutoff)
+            if tasks or categories or options['verbosity'] > 1:
+                self.stdout.write(f'Purged {tasks} task(s) and {categories} category(ies).')
+            if not options['every']:
+                break
+            time.sleep(options['every'])
+
+    def _next_chunk(self, queryset):
+        return list(queryset.values_list('pk', flat=True)[:self.chunk_size])
+
+    def _sleep(self):
+        if self.pause:
+            time.sleep(self.pause)
+
+    def purge_tasks(self, cutoff):
+        purged = 0
+        # Deleting a task cascades to its subtasks, so never delete one that
+        # still has live tasks below it
+        expired = Task.all_objects.filter(deleted_at__lt=cutoff).exclude(has_live_descendants())
+        while ids := self._next_chunk(expired):
+            with transaction.atomic():
+                _, deleted = Task.all_objects.filter(pk__in=ids).delete()
+            # Includes the expired subtasks deleted along with their parents
+            purged += deleted.get(Task._meta.label, 0)
+            self._sleep()
+        return purged
+
+    def purge_categories(self, cutoff):
+        purged = 0
+        expired = Category.all_objects.filter(deleted_at__lt=cutoff)
+        while ids := self._next_chunk(expired):
+            # Detach tasks chunk by chunk first, so the final DELETE has no
+            # large ON DELETE SET NULL update to run inside one transaction
+            attached = Task.all_objects.filter(category_id__in=ids)
+            while task_ids := self._next_chunk(attached):
+                Task.all_objects.filter(pk__in=task_ids).update(category=None)
+                self._sleep()
+            with transaction.atomic():
+                Category.all_objects.filter(pk__in=ids).delete()
+            purged += len(ids)
+            self._sleep()
+        return purged
@@ -0,0 +1,51 @@
+# todo/management/commands/replicate_sqlite.py
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from todo.db_routers import replica_alias
+
+
+class Command(BaseCommand):
+    help = (
+        'Replication stand-in for local development: copy the default SQLite '
+        'database onto the replica SQLite file (TODO_REPLICA_DB). With --every, '
+        'it keeps copying, which mimics an asynchronously lagging replica.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--every', type=float, default=0,
+                            help='Repeat every N seconds instead of copying once.')
+
+    def handle(self, *args, **options):
+        alias = replica_alias()
+        if alias is None:
+            raise CommandError('No replica configured; set TODO_REPLICA_DB to a SQLite file path.')
+
+        primary = settings.DATABASES['default']
+        replica = settings.DATABASES[alias]
+        for db in (primary, replica):
+            if not db['ENGINE'].endswith('sqlite3'):
+                raise CommandError('replicate_sqlite only works with SQLite databases.')
+
+        while True:
+            self.copy(str(primary['NAME']), str(replica['NAME']))
+            if options['verbosity'] > 1:
+                self.stdout.write(f'Replicated {primary["NAME"]} -> {replica["NAME"]}')
+            if not options['every']:
+                break
+            time.sleep(options['every'])
+
+    @staticmethod
+    def copy(source_path, target_path):
+        # The online backup API gives a consistent snapshot even while the
+        # primary is being written to
+        source = sqlite3.connect(source_path)
+        target = sqlite3.connect(target_path)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
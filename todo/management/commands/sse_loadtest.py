@@ -0,0 +1,79 @@
+# todo/management/commands/sse_loadtest.py
+import asyncio
+import resource
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+
+from todo.events import InProcessBroker
+from todo.sse import EventStreamApp
+
+
+class Command(BaseCommand):
+    help = (
+        'Hold many idle Server-Sent Events connections in-process and report '
+        'memory per connection and broadcast latency.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--connections', type=int, default=5000,
+                            help='Number of idle connections to open.')
+        parser.add_argument('--users', type=int, default=100,
+                            help='Number of distinct users the connections are spread over.')
+
+    def handle(self, *args, **options):
+        asyncio.run(self._run(options['connections'], max(1, options['users'])))
+
+    async def _run(self, connections, users):
+        broker = InProcessBroker()
+        app = EventStreamApp(broker=broker)
+        disconnect = asyncio.Event()
+        received = 0
+
+        async def receive():
+            await disconnect.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            nonlocal received
+            if message['type'] == 'http.response.body' and message['body'].startswith(b'event:'):
+                received += 1
+
+        tracemalloc.start()
+        baseline, _ = tracemalloc.get_traced_memory()
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        streams = [
+            asyncio.ensure_future(app.stream(i % users, receive, send))
+            for i in range(connections)
+        ]
+        while broker.subscriber_count() < connections:
+            await asyncio.sleep(0)
+        # Let every stream reach its idle wait before measuring
+        await asyncio.sleep(0.1)
+
+        current, peak = tracemalloc.get_traced_memory()
+        rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        tracemalloc.stop()
+
+        per_connection = (current - baseline) / connections
+        self.stdout.write(f'Idle connections:        {connections} ({users} users)')
+        self.stdout.write(f'Python heap growth:      {(current - baseline) / 1024:.1f} KiB')
+        self.stdout.write(f'Memory per connection:   {per_connection:.0f} bytes')
+        self.stdout.write(f'Peak RSS growth:         {rss_after - rss_before} KiB')
+
+        started = time.perf_counter()
+        for user_id in range(users):
+            broker.publish(user_id, {'model': 'task', 'action': 'saved', 'id': 1})
+        while received < connections:
+            await asyncio.sleep(0)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f'Broadcast to all streams: {elapsed * 1000:.1f} ms')
+
+        disconnect.set()
+        await asyncio.gather(*streams)
+        remaining = broker.subscriber_count()
+        self.stdout.write(self.style.SUCCESS(
+            f'All streams closed, {remaining} subscriptions left behind.'
+        ))
@@ -1,6 +1,12 @@
 # todo/middleware.py
 from django.contrib.auth import get_user_model
 from django.contrib.auth import login
+from django.conf import settings
+from django.core.cache import caches
+from django.http import JsonResponse
+
+from .db_routers import STICKY_COOKIE, mark_sticky
+from .throttling import TokenBucket
 
 User = get_user_model()
 
@@ -38,3 +44,74 @@ class DemoAuthMiddleware:
         
         response = self.get_response(request)
         return response
+
+
+class ReplicaStickinessMiddleware:
+    """
+    Read-your-writes for replica routing: after any write request, keep the
+    user's reads on the primary database until the replica has had time to
+    catch up. A per-user cache entry covers all of the user's tabs and
+    devices; the cookie also covers the writing browser if that cache is
+    not shared between workers.
+    """
+    WRITE_METHODS = ('POST', 'PUT', 'PATCH', 'DELETE')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if request.method in self.WRITE_METHODS:
+            if request.user.is_authenticated:
+                mark_sticky(request.user)
+            response.set_cookie(
+                STICKY_COOKIE,
+                '1',
+                max_age=settings.TODO_REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+
+
+class RateLimitMiddleware:
+    """
+    Token-bucket rate limiting per client for the URL names listed in
+    ``todo.urls.RATE_LIMITS``. A client is the user id together with the IP
+    address, so users sharing one account (such as the demo user) do not
+    share a bucket; URL names in ``RATE_LIMITS_BY_IP`` are keyed on the IP only.
+    Buckets live in the cache named by ``TODO_RATE_LIMIT_CACHE``.
+    Requests over the limit get a 429 JSON response with ``Retry-After``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        from .urls import RATE_LIMITS, RATE_LIMITS_BY_IP
+
+        cache = caches[settings.TODO_RATE_LIMIT_CACHE]
+        self.buckets = {name: TokenBucket(cache, rate) for name, rate in RATE_LIMITS.items()}
+        self.by_ip = RATE_LIMITS_BY_IP
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        url_name = request.resolver_match.url_name if request.resolver_match else None
+        bucket = self.buckets.get(url_name)
+        if bucket is None:
+            return None
+
+        client = f'ip:{request.META.get("REMOTE_ADDR", "")}'
+        if url_name not in self.by_ip and request.user.is_authenticated:
+            client = f'user:{request.user.pk}:{client}'
+
+        allowed, retry_after = bucket.consume(f'ratelimit:{url_name}:{client}')
+        if allowed:
+            return None
+
+        response = JsonResponse({
+            'success': False,
+            'message': 'Too many requests. Please slow down and try again shortly.',
+        }, status=429)
+        response['Retry-After'] = str(retry_after)
+        return response
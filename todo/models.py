@@ -1,11 +1,157 @@
 # todo/models.py
 
-from django.db import models
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import models, router, transaction
+from django.db.models import Count, Exists, F, OuterRef, Q, Value
+from django.db.models.functions import Cast, Concat, LPad, Substr
+from django.db.models.signals import post_save
 from django.contrib.auth.models import User
 from django.utils import timezone
 
 
-class Category(models.Model):
+def undo_cutoff():
+    """Soft-deleted rows older than this can no longer be restored and may be purged."""
+    return timezone.now() - timedelta(seconds=settings.TODO_UNDO_WINDOW_SECONDS)
+
+
+class SoftDeleteQuerySet(models.QuerySet):
+    def soft_delete(self):
+        """Flag all rows as deleted with a single UPDATE."""
+        return self.update(deleted_at=timezone.now())
+
+    def restore(self):
+        """Clear the deleted flag of rows still inside the undo window."""
+        return self.filter(deleted_at__gte=undo_cutoff()).update(deleted_at=None)
+
+    def deleted(self):
+        return self.filter(deleted_at__isnull=False)
+
+
+class LiveManager(models.Manager.from_queryset(SoftDeleteQuerySet)):
+    """Default manager: hides soft-deleted rows."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
+class SoftDeleteModel(models.Model):
+    """
+    Rows are flagged with ``deleted_at`` instead of being removed right away.
+    ``objects`` only returns live rows, ``all_objects`` includes deleted ones.
+    The ``purge_deleted`` command removes them for good once the undo window passed.
+    """
+    deleted_at = models.DateTimeField(blank=True, null=True, editable=False)
+
+    objects = LiveManager()
+    all_objects = SoftDeleteQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+
+    def soft_delete(self):
+        self.deleted_at = timezone.now()
+        self.save(update_fields=['deleted_at'])
+
+    def restore(self):
+        self.deleted_at = None
+        self.save(update_fields=['deleted_at'])
+
+
+# Task.path holds the ids of a task's ancestors, root first, each zero-padded
+# and followed by '/', e.g. "0000000004/0000000017/". Fixed-width segments keep
+# the string order of paths equal to the tree order.
+PATH_SEGMENT_WIDTH = 10
+PATH_MAX_LENGTH = 255
+MAX_TASK_DEPTH = PATH_MAX_LENGTH // (PATH_SEGMENT_WIDTH + 1)
+
+
+def path_segment(pk):
+    return f'{pk:0{PATH_SEGMENT_WIDTH}d}/'
+
+
+def path_depth(path):
+    """Number of ancestors encoded in ``path``; 0 for top-level tasks."""
+    return len(path) // (PATH_SEGMENT_WIDTH + 1)
+
+
+def subtree_range(prefix):
+    """
+    Lookups matching every path that starts with ``prefix``. Written as a range
+    ('0' sorts right after '/') rather than ``startswith``, so it is a plain
+    index range scan on every backend; SQLite cannot use an index for LIKE.
+    """
+    return {'path__gte': prefix, 'path__lt': prefix[:-1] + '0'}
+
+
+def has_live_subtasks(task_ref):
+    """
+    Whether the task referenced by ``task_ref`` (an ``OuterRef`` name) has live
+    subtasks. Progress is rolled up from tasks without them: a parent is done
+    when its subtasks are, so counting it too would weigh it as extra work.
+    """
+    return Exists(Task.objects.filter(parent=OuterRef(task_ref)))
+
+
+def has_live_descendants():
+    """Whether the outer task has live tasks anywhere below it."""
+    outer_prefix = Concat(
+        OuterRef('path'),
+        LPad(Cast(OuterRef('pk'), models.CharField()), PATH_SEGMENT_WIDTH, Value('0')),
+        Value('/'),
+    )
+    return Exists(Task.objects.filter(path__startswith=outer_prefix))
+
+
+class TaskQuerySet(SoftDeleteQuerySet):
+    # Subtrees per query when updating many of them: SQLite parses the OR of
+    # their path ranges into an expression tree limited to a depth of 1000.
+    subtree_batch_size = 200
+
+    def update_descendants_of(self, rows, **changes):
+        """
+        Applies ``changes`` to all descendants of the given ``(pk, path)`` rows.
+        Subtrees nested in another given subtree are skipped, and the rest is
+        updated in batches. Returns the number of updated rows.
+        """
+        prefixes = sorted(path + path_segment(pk) for pk, path in rows)
+        outermost = []
+        for prefix in prefixes:
+            if not outermost or not prefix.startswith(outermost[-1]):
+                outermost.append(prefix)
+
+        updated = 0
+        for start in range(0, len(outermost), self.subtree_batch_size):
+            condition = Q()
+            for prefix in outermost[start:start + self.subtree_batch_size]:
+                condition |= Q(**subtree_range(prefix))
+            updated += self.filter(condition).update(**changes)
+        return updated
+
+    def restore(self):
+        """
+        Restores the tasks deleted within the undo window, the subtasks deleted
+        along with them and their deleted ancestors: a live task must never sit
+        below a deleted one, which `purge_deleted` would remove with it.
+        Returns the number of restored tasks, not counting the others.
+        """
+        cutoff = undo_cutoff()
+        rows = list(self.filter(deleted_at__gte=cutoff).values_list('pk', 'path'))
+        ancestor_ids = {int(segment) for _, path in rows for segment in path.split('/') if segment}
+        deleted = Task.all_objects.filter(deleted_at__gte=cutoff)
+        with transaction.atomic(using=self.db):
+            restored = deleted.filter(pk__in=[pk for pk, _ in rows]).update(deleted_at=None)
+            deleted.update_descendants_of(rows, deleted_at=None)
+            deleted.filter(pk__in=ancestor_ids).update(deleted_at=None)
+        return restored
+
+
+class TaskLiveManager(LiveManager.from_queryset(TaskQuerySet)):
+    pass
+
+
+class Category(SoftDeleteModel):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='categories')
     name = models.CharField(max_length=100)
     color = models.CharField(max_length=7, default='#2e86de') # Store hex color
@@ -15,9 +161,14 @@ class Category(models.Model):
 
     class Meta:
         verbose_name_plural = 'Categories'
+        indexes = [
+            models.Index(fields=['user', 'deleted_at'], name='todo_category_live_idx'),
+            models.Index(fields=['deleted_at'], condition=models.Q(deleted_at__isnull=False),
+                         name='todo_category_purge_idx'),
+        ]
 
 
-class Task(models.Model):
+class Task(SoftDeleteModel):
     
     class Priority(models.TextChoices):
         HIGH = 'high', 'High'
@@ -31,6 +182,9 @@ class Task(models.Model):
 
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='tasks')
     category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, blank=True, related_name='tasks')
+    parent = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True, related_name='subtasks')
+    # Materialized ancestor path, maintained in save(); see PATH_SEGMENT_WIDTH
+    path = models.CharField(max_length=PATH_MAX_LENGTH, blank=True, default='', editable=False)
     
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True, null=True)  # Will store rich HTML content
@@ -50,16 +204,166 @@ class Task(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     completed_at = models.DateTimeField(blank=True, null=True)
 
+    # Bumped on every versioned update, for optimistic concurrency control
+    version = models.PositiveIntegerField(default=1, editable=False)
+
+    objects = TaskLiveManager()
+    all_objects = TaskQuerySet.as_manager()
+
     def __str__(self):
         return self.title
 
-    def save(self, *args, **kwargs):
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored tree position, so save() can tell whether the
+        # subtree below has to follow a move or a category change.
+        instance._loaded_tree = (instance.__dict__.get('path'), instance.__dict__.get('category_id'))
+        return instance
+
+    @property
+    def depth(self):
+        return path_depth(self.path)
+
+    @property
+    def subtree_prefix(self):
+        """Common path prefix of all descendants of this task."""
+        return self.path + path_segment(self.pk)
+
+    def get_descendants(self):
+        return Task.objects.filter(**subtree_range(self.subtree_prefix))
+
+    def get_subtree(self):
+        """This task and all its descendants, parents before their subtasks."""
+        return Task.objects.filter(
+            Q(pk=self.pk) | Q(**subtree_range(self.subtree_prefix))
+        ).annotate(
+            # Each row's own subtree prefix; sorting by it yields depth-first order
+            tree_key=Concat('path', LPad(Cast('pk', models.CharField()), PATH_SEGMENT_WIDTH, Value('0'))),
+        ).order_by('tree_key')
+
+    def rollup(self):
+        """
+        Subtask counts and completion percentage of the whole subtree,
+        computed with a single aggregate query. Like category progress, the
+        percentage counts only the subtasks without subtasks of their own
+        (see ``has_live_subtasks``). A task without subtasks counts as 0 or
+        100 percent done depending on its own status.
+        """
+        leaf = ~has_live_subtasks('pk')
+        counts = self.get_descendants().aggregate(
+            subtask_count=Count('pk', filter=Q(path=self.subtree_prefix)),
+            descendant_count=Count('pk'),
+            leaf_count=Count('pk', filter=leaf),
+            completed_count=Count('pk', filter=leaf & Q(status=self.Status.COMPLETED)),
+        )
+        if counts['leaf_count']:
+            counts['progress'] = int(counts['completed_count'] / counts['leaf_count'] * 100)
+        else:
+            counts['progress'] = 100 if self.status == self.Status.COMPLETED else 0
+        return counts
+
+    def _sync_tree(self):
+        # A task's path is derived from its parent; new subtasks start in the parent's category
+        if self.parent_id is None:
+            self.path = ''
+            return
+        self.path = self.parent.subtree_prefix
+        if self.pk is None and self.category_id is None:
+            self.category_id = self.parent.category_id
+
+    def _sync_descendants(self):
+        """
+        Moves the subtree along with this task and hands down its category,
+        in one UPDATE over the descendants' path range. Their version is bumped
+        too, so edits based on what they looked like before are rejected.
+        """
+        loaded = getattr(self, '_loaded_tree', None)
+        self._loaded_tree = (self.path, self.category_id)
+        if loaded is None or loaded == self._loaded_tree:
+            return
+        old_path, old_category_id = loaded
+        old_prefix = (old_path or '') + path_segment(self.pk)
+        changes = {'category_id': self.category_id, 'version': F('version') + 1}
+        if old_path != self.path:
+            changes['path'] = Concat(Value(self.subtree_prefix), Substr('path', len(old_prefix) + 1))
+        Task.all_objects.filter(**subtree_range(old_prefix)).update(**changes)
+
+    def _sync_completed_at(self):
         # Automatically set completed_at when status is changed to completed
         if self.status == self.Status.COMPLETED and not self.completed_at:
             self.completed_at = timezone.now()
         elif self.status != self.Status.COMPLETED:
             self.completed_at = None
-        super().save(*args, **kwargs)
+
+    def save(self, *args, **kwargs):
+        self._sync_completed_at()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'parent' in update_fields:
+            self._sync_tree()
+        if update_fields is None or {'parent', 'category'} & set(update_fields):
+            # The subtree must never be left behind its parent
+            with transaction.atomic(using=router.db_for_write(Task, instance=self)):
+                super().save(*args, **kwargs)
+                self._sync_descendants()
+        else:
+            super().save(*args, **kwargs)
+
+    def soft_delete(self):
+        # Subtasks go (and come back) together with their parent
+        super().soft_delete()
+        self.get_descendants().update(deleted_at=self.deleted_at)
+
+    def restore(self):
+        # Same rules as restoring from a queryset ("Undo"), see TaskQuerySet.restore()
+        Task.all_objects.filter(pk=self.pk).restore()
+        self.deleted_at = None
+
+    def save_if_version(self, expected_version, update_fields):
+        """
+        Writes only ``update_fields`` with ``UPDATE ... WHERE version = expected_version``
+        and bumps the version. Returns False, without writing anything, when the
+        task was changed by someone else since ``expected_version`` was read.
+        """
+        update_fields = set(update_fields)
+        if 'status' in update_fields:
+            self._sync_completed_at()
+            update_fields.add('completed_at')
+        if 'parent' in update_fields:
+            self._sync_tree()
+            update_fields.add('path')
+
+        values = {
+            self._meta.get_field(name).attname: getattr(self, self._meta.get_field(name).attname)
+            for name in update_fields
+        }
+        using = router.db_for_write(Task, instance=self)
+        with transaction.atomic(using=using):
+            updated = Task.objects.filter(pk=self.pk, version=expected_version).update(
+                version=expected_version + 1, **values
+            )
+            if not updated:
+                return False
+            if update_fields & {'parent', 'category'}:
+                self._sync_descendants()
+
+        self.version = expected_version + 1
+        # QuerySet.update() skips model signals; send post_save like save() would
+        post_save.send(
+            sender=Task, instance=self, created=False, raw=False,
+            using=using,
+            update_fields=frozenset(update_fields | {'version'}),
+        )
+        return True
 
     class Meta:
-        ordering = ['-created_at']
\ No newline at end of file
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'deleted_at'], name='todo_task_live_idx'),
+            models.Index(fields=['deleted_at'], condition=models.Q(deleted_at__isnull=False),
+                         name='todo_task_purge_idx'),
+            models.Index(fields=['path'], name='todo_task_path_idx'),
+            # Calendar feed: live tasks of one user due in a date window
+            models.Index(fields=['user', 'due_date'], condition=models.Q(deleted_at__isnull=True),
+                         name='todo_task_due_idx'),
+        ]
@@ -0,0 +1,51 @@
+# todo/signals.py
+"""
+Model signal handlers that push live update events to connected clients.
+Events are published only after the surrounding transaction commits, so
+listeners never refetch data that is not visible yet.
+"""
+
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .events import publish_change
+from .models import Task, Category
+
+
+def _publish_on_commit(instance, model, action):
+    transaction.on_commit(partial(publish_change, instance.user_id, model, action, instance.pk))
+
+
+def _publish_saved(instance, model):
+    # A soft delete is a save that sets deleted_at; report it as a deletion
+    action = 'deleted' if instance.deleted_at else 'saved'
+    _publish_on_commit(instance, model, action)
+
+
+def _publish_deleted(instance, model):
+    # Purging a soft-deleted row was already announced when it was flagged
+    if instance.deleted_at is None:
+        _publish_on_commit(instance, model, 'deleted')
+
+
+@receiver(post_save, sender=Task, dispatch_uid='todo_task_saved')
+def task_saved(sender, instance, **kwargs):
+    _publish_saved(instance, 'task')
+
+
+@receiver(post_delete, sender=Task, dispatch_uid='todo_task_deleted')
+def task_deleted(sender, instance, **kwargs):
+    _publish_deleted(instance, 'task')
+
+
+@receiver(post_save, sender=Category, dispatch_uid='todo_category_saved')
+def category_saved(sender, instance, **kwargs):
+    _publish_saved(instance, 'category')
+
+
+@receiver(post_delete, sender=Category, dispatch_uid='todo_category_deleted')
+def category_deleted(sender, instance, **kwargs):
+    _publish_deleted(instance, 'category')
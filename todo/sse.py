@@ -0,0 +1,127 @@
+# todo/sse.py
+"""
+Server-Sent Events endpoint for live task/category updates.
+
+This is a bare ASGI application mounted in ``config/asgi.py`` next to the
+Django application. Idle connections only hold a queue and a small task,
+so the full Django request/middleware stack is not kept alive per client.
+"""
+
+import asyncio
+import json
+from importlib import import_module
+from types import SimpleNamespace
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user
+
+from .events import get_broker
+
+
+EVENTS_PATH = '/events/'
+
+
+def _format_event(event):
+    data = json.dumps(event, separators=(',', ':'))
+    return f"event: {event['model']}\ndata: {data}\n\n".encode()
+
+
+class EventStreamApp:
+    """
+    Streams the current user's change events as ``text/event-stream``.
+    Anonymous requests are rejected with 401.
+    """
+
+    # Seconds between keepalive comments, so proxies do not drop idle streams
+    keepalive = 15
+    # Client reconnect delay advertised to the browser, in milliseconds
+    retry = 5000
+
+    def __init__(self, broker=None):
+        self._broker = broker
+
+    @property
+    def broker(self):
+        return self._broker or get_broker()
+
+    async def __call__(self, scope, receive, send):
+        if scope['method'] != 'GET':
+            await self._respond(send, 405, b'Method not allowed')
+            return
+
+        user_id = await self._authenticate(scope)
+        if user_id is None:
+            await self._respond(send, 401, b'Not authenticated')
+            return
+
+        await self.stream(user_id, receive, send)
+
+    async def stream(self, user_id, receive, send):
+        """Hold the connection open and forward events until the client leaves."""
+        subscription = self.broker.subscribe(user_id)
+        watcher = asyncio.ensure_future(self._wait_for_disconnect(receive, subscription))
+        try:
+            await send({
+                'type': 'http.response.start',
+                'status': 200,
+                'headers': [
+                    (b'content-type', b'text/event-stream'),
+                    (b'cache-control', b'no-cache'),
+                    (b'x-accel-buffering', b'no'),
+                ],
+            })
+            await self._send_chunk(send, f'retry: {self.retry}\n\n'.encode())
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.get(), self.keepalive)
+                except asyncio.TimeoutError:
+                    await self._send_chunk(send, b': keepalive\n\n')
+                    continue
+                if event is None:
+                    break
+                await self._send_chunk(send, _format_event(event))
+        finally:
+            self.broker.unsubscribe(subscription)
+            watcher.cancel()
+
+    async def _wait_for_disconnect(self, receive, subscription):
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                subscription.close()
+                return
+
+    async def _authenticate(self, scope):
+        """Resolve the user id from the Django session cookie, if any."""
+        session_key = self._get_cookie(scope, settings.SESSION_COOKIE_NAME)
+        if not session_key:
+            return None
+        store = import_module(settings.SESSION_ENGINE).SessionStore(session_key)
+        user = await sync_to_async(get_user)(SimpleNamespace(session=store))
+        return user.pk if user.is_authenticated else None
+
+    @staticmethod
+    def _get_cookie(scope, name):
+        for header, value in scope.get('headers', []):
+            if header != b'cookie':
+                continue
+            for part in value.decode('latin-1').split(';'):
+                key, _, morsel = part.strip().partition('=')
+                if key == name:
+                    return morsel
+        return None
+
+    @staticmethod
+    async def _send_chunk(send, body):
+        await send({'type': 'http.response.body', 'body': body, 'more_body': True})
+
+    @staticmethod
+    async def _respond(send, status, body):
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(b'content-type', b'text/plain')],
+        })
+        await send({'type': 'http.response.body', 'body': body})
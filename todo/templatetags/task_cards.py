@@ -0,0 +1,26 @@
+# todo/templatetags/task_cards.py
+from django import template
+from django.template import Context
+from django.utils.safestring import mark_safe
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def render_cards(context, cards, template_name):
+    """
+    Renders one card partial per item, e.g.
+    ``{% render_cards cards 'todo/partials/task_card.html' %}``.
+
+    The partial is looked up once and rendered against a small context that
+    only holds ``card`` and ``csrf_token``, instead of going through
+    ``{% include %}`` and the full page context for every card.
+    """
+    partial = context.template.engine.get_template(template_name)
+    card_context = Context({'csrf_token': context.get('csrf_token')}, autoescape=context.autoescape)
+
+    parts = []
+    for card in cards:
+        with card_context.push(card=card):
+            parts.append(partial.render(card_context))
+    return mark_safe(''.join(parts))
@@ -0,0 +1,122 @@
+# todo/throttling.py
+"""
+Request throttling helpers for TaskMitra.
+
+* ``TokenBucket``: per-client token buckets stored in a Django cache, used by
+  ``todo.middleware.RateLimitMiddleware`` with the per-URL-name limits in
+  ``todo/urls.py``.
+* ``coalesce_requests``: a view decorator that lets identical concurrent GET
+  requests share one execution (and one set of DB queries).
+"""
+
+import math
+import threading
+import time
+from functools import wraps
+
+from django.http import HttpResponse
+
+
+RATE_PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """
+    Parses ``'30/m'`` into ``(30, 60)``: at most 30 requests per 60 seconds.
+    """
+    count, _, period = rate.partition('/')
+    try:
+        return int(count), RATE_PERIODS[period[:1]]
+    except (ValueError, KeyError):
+        raise ValueError(f'Invalid rate {rate!r}; expected e.g. "30/m".')
+
+
+class TokenBucket:
+    """
+    A bucket holds up to ``count`` tokens and refills at ``count / period``
+    tokens per second; each request takes one token.
+
+    The read-modify-write is serialized per process. With a shared cache
+    (e.g. Redis) several processes may race, which at worst lets a few
+    extra requests through.
+    """
+    _lock = threading.Lock()
+
+    def __init__(self, cache, rate):
+        self.cache = cache
+        self.capacity, period = parse_rate(rate)
+        self.refill_rate = self.capacity / period
+        self.timeout = math.ceil(period) + 1
+
+    def consume(self, key):
+        """Takes a token; returns ``(allowed, retry_after_seconds)``."""
+        with self._lock:
+            # Wall-clock time, so buckets in a shared cache agree across processes
+            now = time.time()
+            tokens, updated_at = self.cache.get(key) or (self.capacity, now)
+            tokens = min(self.capacity, tokens + (now - updated_at) * self.refill_rate)
+
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self.cache.set(key, (tokens, now), self.timeout)
+
+        retry_after = 0 if allowed else math.ceil((1 - tokens) / self.refill_rate)
+        return allowed, retry_after
+
+
+class _InFlight:
+    __slots__ = ('done', 'response')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+
+
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+
+def _copy_response(response):
+    copy = HttpResponse(response.content, status=response.status_code)
+    for header, value in response.items():
+        copy[header] = value
+    return copy
+
+
+def coalesce_requests(view_func):
+    """
+    Decorator: while a GET for the same user, URL and ``X-Requested-With``
+    header is being processed, identical requests wait for it and get a copy
+    of its response instead of running the view (and its queries) again.
+    Only successful, non-streaming responses are shared; cookies are not.
+    """
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        if request.method != 'GET':
+            return view_func(request, *args, **kwargs)
+
+        key = (request.user.pk, request.get_full_path(), request.headers.get('X-Requested-With'))
+        with _in_flight_lock:
+            call = _in_flight.get(key)
+            leader = call is None
+            if leader:
+                call = _in_flight[key] = _InFlight()
+
+        if not leader:
+            call.done.wait()
+            if call.response is not None:
+                return _copy_response(call.response)
+            # The leading request failed; do the work ourselves
+            return view_func(request, *args, **kwargs)
+
+        try:
+            response = view_func(request, *args, **kwargs)
+            if response.status_code == 200 and not response.streaming:
+                call.response = response
+            return response
+        finally:
+            with _in_flight_lock:
+                del _in_flight[key]
+            call.done.set()
+    return _wrapped_view
@@ -9,18 +9,24 @@ urlpatterns = [
     # Page Views
     path('my-tasks/', views.my_tasks, name='my_tasks'),
     path('categories/', views.task_categories, name='task_categories'),
+    path('calendar/', views.calendar_view, name='calendar'),
+    path('calendar/feed/', views.calendar_feed, name='calendar_feed'),
     path('settings/', views.settings_page, name='settings'),
     
     # Task CRUD
     path('task/<int:pk>/', views.task_detail, name='task_detail'),
     path('task/create/', views.task_create, name='task_create'),
     path('task/<int:pk>/update/', views.task_update, name='task_update'),
+    path('task/<int:pk>/subtasks/', views.task_subtasks, name='task_subtasks'),
     path('task/<int:pk>/delete/', views.task_delete, name='task_delete'),
+    path('task/bulk/', views.task_bulk_action, name='task_bulk_action'),
+    path('task/restore/', views.task_restore, name='task_restore'),
     
     # Category CRUD
     path('category/create/', views.category_create, name='category_create'),
     path('category/<int:pk>/update/', views.category_update, name='category_update'),
     path('category/<int:pk>/delete/', views.category_delete, name='category_delete'),
+    path('category/<int:pk>/restore/', views.category_restore, name='category_restore'),
     
     # API Authentication endpoints (for external auth integration)
     path('api/auth/verify-token/', api_auth.api_verify_token, name='api_verify_token'),
@@ -28,4 +34,20 @@ urlpatterns = [
     path('api/auth/user-info/', api_auth.api_user_info, name='api_user_info'),
 ]
 
-# Removed: All authentication URLs (will be handled by another app)
\ No newline at end of file
+# Removed: All authentication URLs (will be handled by another app)
+
+# Per-client request limits by URL name, enforced by RateLimitMiddleware
+# (token bucket: "30/m" allows bursts of 30 and refills 30 per minute).
+RATE_LIMITS = {
+    'task_create': '30/m',
+    'task_update': '120/m',
+    'task_bulk_action': '30/m',
+    'calendar_feed': '120/m',
+    'category_create': '30/m',
+    'api_verify_token': '20/m',
+    'api_create_session': '10/m',
+}
+
+# Limited per IP address only: these run before there is a trustworthy user
+# (they are csrf-exempt and DemoAuthMiddleware logs everyone in as the same user)
+RATE_LIMITS_BY_IP = {'api_verify_token', 'api_create_session'}
@@ -8,11 +8,65 @@ from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 
 # ----------------- Database and Querying Imports -----------------
-from django.db.models import Count, Q
+from django.db import transaction
+from django.db.models import Count, Q, F
+from django.db.models.functions import Coalesce, Now
 
 # ----------------- Local Application Imports -----------------
-from .models import Task, Category
-from .forms import TaskForm, CategoryForm, UserUpdateForm
+from .models import Task, Category, undo_cutoff, path_depth, has_live_subtasks
+from .forms import (
+    TaskForm, CategoryForm, UserUpdateForm, TaskBulkActionForm, TaskRestoreForm, CalendarWindowForm,
+)
+from .events import publish_change
+from .db_routers import read_from_replica
+from .cards import CARD_FIELDS, build_task_cards
+from .calendar_feed import PRIORITIES, build_calendar_feed, feed_rows
+from .throttling import coalesce_requests
+
+
+# ==============================================================================
+#  HELPERS
+# ==============================================================================
+
+def get_status_counts(user):
+    """
+    Returns the number of the user's tasks in each status,
+    computed with a single aggregate query.
+    """
+    return Task.objects.filter(user=user).aggregate(
+        completed_count=Count('pk', filter=Q(status=Task.Status.COMPLETED)),
+        in_progress_count=Count('pk', filter=Q(status=Task.Status.IN_PROGRESS)),
+        not_started_count=Count('pk', filter=Q(status=Task.Status.NOT_STARTED)),
+    )
+
+
+def task_to_dict(task):
+    """
+    Serializes a task for the edit modal (and for 409 conflict responses).
+    """
+    return {
+        'title': task.title,
+        'description': task.description,
+        # A category that is pending deletion is no longer selectable
+        'category': task.category.id if task.category and task.category.deleted_at is None else '',
+        'priority': task.priority,
+        'status': task.status,
+        'due_date': task.due_date.strftime('%Y-%m-%d') if task.due_date else '',
+        'version': task.version,
+        'parent': task.parent_id or '',
+    }
+
+
+def remember_undo(request, message, url, task_ids=()):
+    """
+    Stores what was just soft-deleted so the next page can offer an "Undo" button.
+    It is shown once (see context_processors.add_undo_delete_to_context).
+    """
+    request.session['undo_delete'] = {
+        'message': message,
+        'url': url,
+        'task_ids': list(task_ids),
+    }
 
 
 # ==============================================================================
@@ -20,6 +74,7 @@ from .forms import TaskForm, CategoryForm, UserUpdateForm
 # ==============================================================================
 
 @login_required
+@read_from_replica
 def dashboard(request):
     """
     Displays the main dashboard for an authenticated user.
@@ -29,21 +84,18 @@ def dashboard(request):
     tasks = Task.objects.filter(user=request.user)
 
     # Calculate counts for the "Task Status" overview card
-    completed_count = tasks.filter(status='completed').count()
-    in_progress_count = tasks.filter(status='in-progress').count()
-    not_started_count = tasks.filter(status='not-started').count()
+    status_counts = get_status_counts(request.user)
 
     # Get the 5 most recent tasks that are not yet completed
     recent_tasks = tasks.exclude(status='completed').order_by('-created_at')[:5]
+    recent_cards = build_task_cards(recent_tasks.values_list(*CARD_FIELDS), excerpt_words=20)
 
     # Get the 3 most recently completed tasks
     recently_completed_tasks = tasks.filter(status='completed').order_by('-completed_at')[:3]
 
     context = {
-        'completed_count': completed_count,
-        'in_progress_count': in_progress_count,
-        'not_started_count': not_started_count,
-        'recent_tasks': recent_tasks,
+        **status_counts,
+        'recent_cards': recent_cards,
         'recently_completed_tasks': recently_completed_tasks,
         'active_page': 'dashboard',
     }
@@ -51,6 +103,7 @@ def dashboard(request):
 
 
 @login_required
+@read_from_replica
 def my_tasks(request):
     """
     Displays a grid of all tasks belonging to the current user.
@@ -58,28 +111,37 @@ def my_tasks(request):
     """
     tasks = Task.objects.filter(user=request.user).order_by('-created_at')
     context = {
-        'tasks': tasks,
+        # Cards are built from plain rows; see todo/cards.py
+        'cards': build_task_cards(tasks.values_list(*CARD_FIELDS)),
+        'bulk_form': TaskBulkActionForm(user=request.user),
         'active_page': 'my_tasks',
     }
     return render(request, 'todo/my-tasks.html', context)
 
 
 @login_required
+@read_from_replica
 def task_categories(request):
     """
     Displays all categories created by the user.
     It calculates and shows the total task count and completion percentage for each category.
     Also provides a form for creating a new category (used in a modal).
+
+    Progress is rolled up from the tasks without live subtasks, the same rule
+    as Task.rollup() uses for a single subtree.
     """
+    live_tasks = Q(tasks__deleted_at__isnull=True)
+    leaf_tasks = live_tasks & ~has_live_subtasks('tasks')
     categories = Category.objects.filter(user=request.user).annotate(
-        task_count=Count('tasks'),
-        completed_count=Count('tasks', filter=Q(tasks__status='completed'))
+        task_count=Count('tasks', filter=live_tasks),
+        leaf_count=Count('tasks', filter=leaf_tasks),
+        completed_count=Count('tasks', filter=leaf_tasks & Q(tasks__status='completed'))
     )
 
     # Calculate progress percentage in the view for clarity
     for category in categories:
-        if category.task_count > 0:
-            category.progress = int((category.completed_count / category.task_count) * 100)
+        if category.leaf_count > 0:
+            category.progress = int((category.completed_count / category.leaf_count) * 100)
         else:
             category.progress = 0
             
@@ -92,6 +154,37 @@ def task_categories(request):
     return render(request, 'todo/task-categories.html', context)
 
 
+@login_required
+def calendar_view(request):
+    """
+    Displays the user's tasks on a month or week calendar.
+    The page itself is static; tasks are loaded from ``calendar_feed``
+    for the visible date window.
+    """
+    context = {
+        'priorities': PRIORITIES,
+        'active_page': 'calendar',
+    }
+    return render(request, 'todo/calendar.html', context)
+
+
+@login_required
+@read_from_replica
+@coalesce_requests
+def calendar_feed(request):
+    """
+    Returns the tasks due between ``start`` and ``end`` (``YYYY-MM-DD``) as
+    a compact columnar JSON feed; see todo/calendar_feed.py for the format.
+    """
+    form = CalendarWindowForm(request.GET)
+    if not form.is_valid():
+        return JsonResponse({'success': False, 'errors': form.errors}, status=400)
+
+    start, end = form.cleaned_data['start'], form.cleaned_data['end']
+    feed = build_calendar_feed(feed_rows(request.user, start, end), start, end)
+    return JsonResponse({'success': True, **feed}, json_dumps_params={'separators': (',', ':')})
+
+
 @login_required
 def settings_page(request):
     """
@@ -133,6 +226,23 @@ def task_detail(request, pk):
     return render(request, 'todo/task_detail.html', context)
 
 
+@login_required
+@read_from_replica
+def task_subtasks(request, pk):
+    """
+    Returns a task's subtasks (depth-first, with their nesting depth) and the
+    rollup of the whole subtree as JSON, for the task detail modal.
+    The subtree and the rollup are one indexed query each.
+    """
+    task = get_object_or_404(Task, pk=pk, user=request.user)
+    subtasks = [
+        {'id': task_id, 'title': title, 'status': status, 'depth': path_depth(path) - task.depth}
+        for task_id, title, status, path in task.get_subtree().values_list('id', 'title', 'status', 'path')
+        if task_id != task.pk
+    ]
+    return JsonResponse({'success': True, 'rollup': task.rollup(), 'subtasks': subtasks})
+
+
 @login_required
 def task_create(request):
     """
@@ -156,33 +266,45 @@ def task_create(request):
 
 
 @login_required
+@coalesce_requests
 def task_update(request, pk):
     """
     Handles updating an existing task via AJAX POST request.
     Returns a JSON response indicating success or failure.
+
+    Uses optimistic locking: the client posts the ``version`` it loaded, only
+    the changed fields are written, and if the task was modified in the
+    meantime nothing is saved and a 409 with the current task is returned.
     """
     task = get_object_or_404(Task, pk=pk, user=request.user)
     
     if request.method == 'POST':
         form = TaskForm(request.POST, instance=task, user=request.user)
         if form.is_valid():
-            form.save()
-            return JsonResponse({'success': True, 'message': 'Task updated successfully!'})
+            # Clients that don't send a version are checked against the row as loaded above
+            try:
+                expected_version = int(request.POST['version'])
+            except (KeyError, ValueError):
+                expected_version = task.version
+
+            task = form.save(commit=False)
+            if form.has_changed():
+                if not task.save_if_version(expected_version, form.changed_data):
+                    current = get_object_or_404(Task, pk=pk, user=request.user)
+                    return JsonResponse({
+                        'success': False,
+                        'conflict': True,
+                        'message': 'This task was changed somewhere else. Review the latest version and try again.',
+                        'task': task_to_dict(current),
+                    }, status=409)
+            return JsonResponse({'success': True, 'message': 'Task updated successfully!', 'version': task.version})
         else:
             # If the form is invalid, return the errors as JSON
             return JsonResponse({'success': False, 'errors': form.errors})
     
     # If it's a GET request, return task data as JSON for populating the edit form
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-        task_data = {
-            'title': task.title,
-            'description': task.description,
-            'category': task.category.id if task.category else '',
-            'priority': task.priority,
-            'status': task.status,
-            'due_date': task.due_date.strftime('%Y-%m-%d') if task.due_date else '',
-        }
-        return JsonResponse({'success': True, 'task': task_data})
+        return JsonResponse({'success': True, 'task': task_to_dict(task)})
     
     # Fallback for non-AJAX GET requests
     return JsonResponse({'success': False, 'message': 'Invalid request method.'}, status=405)
@@ -193,18 +315,119 @@ def task_delete(request, pk):
     """
     Handles the deletion of a task.
     On GET, it shows a confirmation page.
-    On POST, it deletes the task and redirects to the task list.
+    On POST, it soft-deletes the task (restorable during the undo window)
+    and redirects to the task list.
     """
     task = get_object_or_404(Task, pk=pk, user=request.user)
     if request.method == 'POST':
-        task_title = task.title
-        task.delete()
-        messages.success(request, f'Task "{task_title}" has been deleted.')
+        task.soft_delete()
+        message = f'Task "{task.title}" has been deleted.'
+        messages.success(request, message)
+        remember_undo(request, message, reverse('task_restore'), [task.pk])
         return redirect('my_tasks')
         
     return render(request, 'todo/confirm_delete.html', {'object': task})
 
 
+@login_required
+def task_restore(request):
+    """
+    Restores one or more soft-deleted tasks ("Undo") via a POST request.
+    Only tasks deleted within the undo window can be restored.
+    """
+    if request.method == 'POST':
+        form = TaskRestoreForm(request.POST)
+        if form.is_valid():
+            tasks = Task.all_objects.filter(user=request.user, pk__in=form.cleaned_data['task_ids'])
+            # Also brings back their subtasks and any deleted parents
+            restored = tasks.restore()
+            if restored:
+                # QuerySet.update() skips model signals, so notify live clients once
+                transaction.on_commit(
+                    lambda: publish_change(request.user.id, 'task', 'saved', None)
+                )
+                messages.success(request, f'{restored} task{"s" if restored != 1 else ""} restored.')
+            else:
+                messages.error(request, 'These tasks can no longer be restored.')
+
+    return redirect('my_tasks')
+
+
+@login_required
+def task_bulk_action(request):
+    """
+    Applies one action (complete, reopen, reprioritize, move category, delete)
+    to several selected tasks via an AJAX POST request.
+    Each action runs as a single UPDATE/DELETE scoped to the user's tasks,
+    and the updated status counts are returned once for the whole batch.
+    Moving and deleting also apply to the subtasks of the selected tasks.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'message': 'Invalid request method.'}, status=405)
+
+    form = TaskBulkActionForm(request.POST, user=request.user)
+    if not form.is_valid():
+        return JsonResponse({'success': False, 'errors': form.errors})
+
+    action = form.cleaned_data['action']
+    tasks = Task.objects.filter(user=request.user, pk__in=form.cleaned_data['task_ids'])
+    Action = TaskBulkActionForm.Action
+    # Selected tasks that have subtasks; category moves and deletes apply to their whole subtree
+    parent_rows = tasks.filter(
+        has_live_subtasks('pk')
+    ).values_list('pk', 'path')
+    subtasks = Task.objects.filter(user=request.user)
+
+    with transaction.atomic():
+        if action == Action.COMPLETE:
+            # Keep the original completion time of tasks that were already completed
+            affected = tasks.update(
+                status=Task.Status.COMPLETED,
+                completed_at=Coalesce(F('completed_at'), Now()),
+                version=F('version') + 1,
+            )
+        elif action == Action.REOPEN:
+            # Only completed tasks are reopened; in-progress ones keep their status
+            affected = tasks.filter(status=Task.Status.COMPLETED).update(
+                status=Task.Status.NOT_STARTED, completed_at=None, version=F('version') + 1,
+            )
+        elif action == Action.PRIORITY:
+            affected = tasks.update(
+                priority=form.cleaned_data['priority'], version=F('version') + 1,
+            )
+        elif action == Action.CATEGORY:
+            rows = list(parent_rows)
+            affected = tasks.update(
+                category=form.cleaned_data['category'], version=F('version') + 1,
+            )
+            subtasks.update_descendants_of(
+                rows, category=form.cleaned_data['category'], version=F('version') + 1,
+            )
+        else:
+            # Soft delete: a single UPDATE, purged later by `purge_deleted`
+            rows = list(parent_rows)
+            affected = tasks.soft_delete()
+            subtasks.update_descendants_of(rows, deleted_at=Now())
+            remember_undo(
+                request,
+                f'{affected} task{"s" if affected != 1 else ""} deleted.',
+                reverse('task_restore'),
+                form.cleaned_data['task_ids'],
+            )
+
+        # QuerySet.update() skips model signals, so notify live clients once
+        transaction.on_commit(
+            lambda: publish_change(request.user.id, 'task', 'saved', None)
+        )
+
+    return JsonResponse({
+        'success': True,
+        'message': f'{affected} task{"s" if affected != 1 else ""} updated.',
+        'affected': affected,
+        'counts': get_status_counts(request.user),
+    })
+
+
 # ==============================================================================
 #  CATEGORY CRUD (Create, Read, Update, Delete) VIEWS
 # ==============================================================================
@@ -247,12 +470,32 @@ def category_delete(request, pk):
     """
     Handles the deletion of a category.
     It's recommended to handle this with a POST request for security.
+    The category is only flagged as deleted, so this returns instantly even for
+    large categories; its tasks are detached later by `purge_deleted`.
     """
     category = get_object_or_404(Category, pk=pk, user=request.user)
     if request.method == 'POST':
-        category_name = category.name
-        category.delete()
-        messages.success(request, f'Category "{category_name}" has been deleted.')
+        category.soft_delete()
+        message = f'Category "{category.name}" has been deleted.'
+        messages.success(request, message)
+        remember_undo(request, message, reverse('category_restore', args=[category.pk]))
         return redirect('task_categories')
         
-    return render(request, 'todo/confirm_delete.html', {'object': category})
\ No newline at end of file
+    return render(request, 'todo/confirm_delete.html', {'object': category})
+
+
+@login_required
+def category_restore(request, pk):
+    """
+    Restores a soft-deleted category ("Undo") via a POST request,
+    as long as it is still inside the undo window.
+    """
+    category = get_object_or_404(Category.all_objects.deleted(), pk=pk, user=request.user)
+    if request.method == 'POST':
+        if category.deleted_at >= undo_cutoff():
+            category.restore()
+            messages.success(request, f'Category "{category.name}" restored.')
+        else:
+            messages.error(request, f'Category "{category.name}" can no longer be restored.')
+
+    return redirect('task_categories')
\ No newline at end of file